@@ -49,9 +49,14 @@ Features:
   - Path highlighting: custom patterns (dark orange), images (dark purple)
 """
 
+import os
+import stat
 import sys
-import re
-import argparse
+
+try:
+    import ahocorasick  # type: ignore  # optional, speeds up large pattern lists
+except Exception:
+    ahocorasick = None
 
 # ============================================================================
 # USER CONFIGURATION
@@ -90,100 +95,159 @@ METHOD_WIDTH = 6      # GET, POST, DELETE, etc.
 STATUS_WIDTH = 3      # 200, 404, etc.
 CACHE_WIDTH = 3       # [B], [H], [M], [-]
 
-# Compiled regex patterns for log parsing (performance optimization)
-# Standard nginx "combined" format: $remote_addr - $remote_user [$time_local] "$request" $status $body_bytes_sent "$http_referer" "$http_user_agent"
-COMBINED_PATTERN = re.compile(r'^(\S+) - (\S+) \[([^\]]+)\] "([^"]*)" (\d+) (\S+) "([^"]*)" "([^"]*)"')
+# Output flush threshold for batch mode (stdin is a regular file)
+BATCH_BYTES = 256 * 1024
+
+# Minimum input size before parallel batch mode is worth the pool startup
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+# Regex patterns for log parsing (fallback for lines the fast splitters
+# reject); compiled lazily on first use so `re` stays off the startup path
+COMBINED_PATTERN = None
+CUSTOM_PATTERN = None
 
-# Custom format with cache status and server name (backward compatibility)
-CUSTOM_PATTERN = re.compile(r'^\[([^\]]+)\] ([^\|]+) \| ([^\|]+) \| (\d+) \[([^\]]+)\] (.*?) \| Ref: "(.*?)" UA: "(.*?)"\s*$')
+def _fallback_patterns():
+    """Compile the fallback regexes on first use."""
+    global COMBINED_PATTERN, CUSTOM_PATTERN
+    if COMBINED_PATTERN is None:
+        import re
+        # Standard nginx "combined" format: $remote_addr - $remote_user [$time_local] "$request" $status $body_bytes_sent "$http_referer" "$http_user_agent"
+        COMBINED_PATTERN = re.compile(r'^(\S+) - (\S+) \[([^\]]+)\] "([^"]*)" (\d+) (\S+) "([^"]*)" "([^"]*)"')
+
+        # Custom format with cache status and server name (backward compatibility).
+        # server_name and remote_addr are captured as single tokens with the
+        # separators absorbing any padding, so the groups never carry stray
+        # whitespace into the IP/hostname lookups downstream
+        CUSTOM_PATTERN = re.compile(r'^\[([^\]]+)\] +([^\s\|]+) +\| +([^\s\|]+) +\| +(\d+) \[([^\]]+)\] (.*?) \| Ref: "(.*?)" UA: "(.*?)"\s*$')
+    return COMBINED_PATTERN, CUSTOM_PATTERN
 
 # Image file extensions for path colorization
 IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico')
+IMAGE_EXT_SET = frozenset(IMAGE_EXTENSIONS)
 
 # ANSI color codes
-class Colors:
-    RESET = '\033[0m'
-
-    # Text colors (all 256-color for consistency across terminals)
-    DARK_GRAY = '\033[90m'             # Timestamp, Ref, UA
-    CYAN = '\033[38;5;51m'             # IP address
-    ORANGE = '\033[38;5;208m'          # Special server IPs
-    DARK_ORANGE = '\033[38;5;94m'      # Special path patterns
-    BRIGHT_CYAN = '\033[38;5;87m'      # Server name
-    MAGENTA = '\033[38;5;201m'         # Pipe separators
-    DARK_PURPLE = '\033[38;5;90m'      # Image requests (dark magenta)
-    RED = '\033[38;5;196m'             # POST method
-    GRAY = '\033[90m'                  # HEAD/other methods
-    BRIGHT_YELLOW = '\033[38;5;226m'   # User's own IP
-    DARK_GREEN = '\033[38;5;028m'      # Post author IPs
-
-    # HTTP status code colors (256-color codes)
-    STATUS_200 = '\033[38;5;46m'       # Bright green for 200 OK
-    STATUS_REDIRECT = '\033[38;5;039m' # Fun blue for 301, 302
-    STATUS_304 = '\033[38;5;028m'      # Medium-bright green for 304 Not Modified
-    STATUS_403 = '\033[38;5;124m'      # Dark red for 403 Forbidden
-    STATUS_404 = '\033[38;5;240;48;5;250m'  # Dark gray text on light gray background for 404 Not Found
-    STATUS_5XX = '\033[38;5;232;48;5;196m'  # Black text on bright red background for 5xx Server Errors
-    STATUS_OTHER = '\033[38;5;255m'    # Bright white for all else
-
-    # Cache status colors (256-color codes)
-    CACHE_HIT = '\033[38;5;40m'        # Green for HIT
-    CACHE_BYPASS = '\033[33m'          # Yellow for BYPASS
-    CACHE_MISS = '\033[38;5;39m'       # Blue for MISS
-    CACHE_NONE = '\033[38;5;240m'      # Gray for - (no cache status provided)
+# Module-level bindings (not class attributes) so hot-path lookups are a
+# single LOAD_GLOBAL instead of LOAD_GLOBAL + LOAD_ATTR per color
+RESET = '\033[0m'
+
+# Text colors (all 256-color for consistency across terminals)
+DARK_GRAY = '\033[90m'             # Timestamp, Ref, UA
+CYAN = '\033[38;5;51m'             # IP address
+ORANGE = '\033[38;5;208m'          # Special server IPs
+DARK_ORANGE = '\033[38;5;94m'      # Special path patterns
+BRIGHT_CYAN = '\033[38;5;87m'      # Server name
+MAGENTA = '\033[38;5;201m'         # Pipe separators
+DARK_PURPLE = '\033[38;5;90m'      # Image requests (dark magenta)
+RED = '\033[38;5;196m'             # POST method
+GRAY = '\033[90m'                  # HEAD/other methods
+BRIGHT_YELLOW = '\033[38;5;226m'   # User's own IP
+DARK_GREEN = '\033[38;5;028m'      # Post author IPs
+
+# HTTP status code colors (256-color codes)
+STATUS_200 = '\033[38;5;46m'       # Bright green for 200 OK
+STATUS_REDIRECT = '\033[38;5;039m' # Fun blue for 301, 302
+STATUS_304 = '\033[38;5;028m'      # Medium-bright green for 304 Not Modified
+STATUS_403 = '\033[38;5;124m'      # Dark red for 403 Forbidden
+STATUS_404 = '\033[38;5;240;48;5;250m'  # Dark gray text on light gray background for 404 Not Found
+STATUS_5XX = '\033[38;5;232;48;5;196m'  # Black text on bright red background for 5xx Server Errors
+STATUS_OTHER = '\033[38;5;255m'    # Bright white for all else
+
+# Cache status colors (256-color codes)
+CACHE_HIT = '\033[38;5;40m'        # Green for HIT
+CACHE_BYPASS = '\033[33m'          # Yellow for BYPASS
+CACHE_MISS = '\033[38;5;39m'       # Blue for MISS
+CACHE_NONE = '\033[38;5;240m'      # Gray for - (no cache status provided)
 
 # Fast lookup tables for status/cache colors
 STATUS_COLOR_MAP = {
-    '200': Colors.STATUS_200,
-    '301': Colors.STATUS_REDIRECT,
-    '302': Colors.STATUS_REDIRECT,
-    '304': Colors.STATUS_304,
-    '400': Colors.STATUS_403,
-    '403': Colors.STATUS_403,
-    '404': Colors.STATUS_404,
-    '405': Colors.STATUS_403,
-}
-
-CACHE_COLOR_MAP = {
-    'HIT': Colors.CACHE_HIT,
-    'BYPASS': Colors.CACHE_BYPASS,
-    'MISS': Colors.CACHE_MISS,
+    '200': STATUS_200,
+    '301': STATUS_REDIRECT,
+    '302': STATUS_REDIRECT,
+    '304': STATUS_304,
+    '400': STATUS_403,
+    '403': STATUS_403,
+    '404': STATUS_404,
+    '405': STATUS_403,
 }
 
-CACHE_ABBREV_MAP = {
-    'HIT': 'H',
-    'BYPASS': 'B',
-    'MISS': 'M',
-    '-': '-',
+# Pre-expand all 5xx codes so the hot path is one dict probe with no
+# startswith branch (the full table is still tiny)
+STATUS_COLOR_FULL = {str(code): STATUS_5XX for code in range(500, 600)}
+STATUS_COLOR_FULL.update(STATUS_COLOR_MAP)
+
+# Merged cache table: one probe returns (color, bracketed abbreviation)
+CACHE_DISPLAY_MAP = {
+    'HIT': (CACHE_HIT, '[H]'),
+    'BYPASS': (CACHE_BYPASS, '[B]'),
+    'MISS': (CACHE_MISS, '[M]'),
+    '-': (CACHE_NONE, '[-]'),
 }
+CACHE_DISPLAY_DEFAULT = (CACHE_NONE, '[---]')
+
+def _build_path_automaton():
+    """Build an Aho-Corasick automaton over SPECIAL_PATH_PATTERNS.
+
+    Matching all patterns in one pass is O(|path|) regardless of how many
+    patterns are configured. Returns None when pyahocorasick isn't installed
+    or the list is small enough that the plain loop wins.
+    """
+    if ahocorasick is None or len(SPECIAL_PATH_PATTERNS) <= 3:
+        return None
+    automaton = ahocorasick.Automaton()
+    for pattern in SPECIAL_PATH_PATTERNS:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
+
+PATH_AUTOMATON = _build_path_automaton()
+
+def build_ip_colors(my_ip=None, author_ips=None):
+    """Merge the IP highlight rules into a single color lookup table.
+
+    Priority (my_ip > author_ips > special servers) is encoded by insertion
+    order: later assignments override earlier ones. The per-line check is
+    then one dict lookup instead of three branches.
+    """
+    ip_colors = {}
+    for ip in SPECIAL_SERVER_IPS:
+        ip_colors[ip] = ORANGE
+    if author_ips:
+        for ip in author_ips:
+            ip_colors[ip] = DARK_GREEN
+    if my_ip:
+        ip_colors[my_ip] = BRIGHT_YELLOW
+    return ip_colors
+
+# Default table when the caller doesn't supply CLI highlight flags
+DEFAULT_IP_COLORS = build_ip_colors()
 
 def is_ipv6(ip_addr):
-    """Check if an IP address is IPv6 (contains colons)."""
-    return ':' in ip_addr
+    """Check if an IP address is IPv6 (a colon within the first 5 chars)."""
+    return ip_addr.find(':', 0, 5) >= 0
 
 def is_ipv4(ip_addr):
-    """Check if an IP address is IPv4 (contains dots)."""
-    return '.' in ip_addr
+    """Check if an IP address is IPv4 (a dot within the first 4 chars)."""
+    return ip_addr.find('.', 0, 4) >= 0
 
 def get_cache_color(status):
-    """Return color based on cache status."""
-    status = status.strip()
-    return CACHE_COLOR_MAP.get(status, Colors.CACHE_NONE)
+    """Return color based on cache status (expects an already-stripped value)."""
+    return CACHE_DISPLAY_MAP.get(status, CACHE_DISPLAY_DEFAULT)[0]
 
 def get_cache_abbrev(status):
-    """Return abbreviated cache status."""
-    status = status.strip()
-    return CACHE_ABBREV_MAP.get(status, '---')
+    """Return abbreviated cache status (expects an already-stripped value)."""
+    return CACHE_DISPLAY_MAP.get(status, CACHE_DISPLAY_DEFAULT)[1][1:-1]
 
 def get_status_color(status_code):
     """Return color based on HTTP status code."""
-    # Check for 5xx server errors
-    if status_code.startswith('5'):
-        return Colors.STATUS_5XX
-    return STATUS_COLOR_MAP.get(status_code, Colors.STATUS_OTHER)
+    return STATUS_COLOR_FULL.get(status_code, STATUS_OTHER)
 
 def parse_request(request):
-    """Parse HTTP request into method and remaining components."""
+    """Parse HTTP request into method, scheme, path, and version.
+
+    Returns ('', '', request, '') for malformed requests; the result is
+    always four strings (keeping the signature monomorphic is kinder to
+    PyPy's JIT), and version is empty only in the malformed case.
+    """
     request = request.strip()
 
     # Remove scheme prefix if present (from ${scheme_if_http})
@@ -194,53 +258,62 @@ def parse_request(request):
         scheme = request[:scheme_end+3]
         rest = request[scheme_end+3:]
 
-    # Parse method, path, version
-    parts = rest.split(None, 2)  # Split on whitespace, max 3 parts
-    if len(parts) != 3:
-        # Malformed request, return None for method and full request as path
-        return None, request
+    # Method is everything before the first space, version everything after
+    # the last; no intermediate token list is built
+    first = rest.find(' ')
+    last = rest.rfind(' ')
+    if first < 0 or last <= first:
+        # Malformed request, return empty method and full request as path
+        return '', '', request, ''
 
-    method, path, version = parts
-    return method, (scheme, path, version)
+    return rest[:first], scheme, rest[first+1:last], rest[last+1:]
 
 def colorize_method(method):
     """Colorize HTTP method."""
-    if method is None:
+    if not method:
         return ''
 
     # Determine method color
     if method == 'POST':
-        method_color = Colors.RED
+        method_color = RED
     elif method in ('HEAD', 'OPTIONS', 'TRACE', 'CONNECT'):
-        method_color = Colors.GRAY
+        method_color = GRAY
     else:
-        method_color = Colors.RESET  # Default color for GET, etc.
+        method_color = RESET  # Default color for GET, etc.
 
-    return f"{method_color}{method}{Colors.RESET}"
+    # No trailing RESET: the next field emits its own color code
+    return f"{method_color}{method}"
 
-def colorize_path(path_info):
+def colorize_path(scheme, path, version):
     """Colorize path and version."""
-    if isinstance(path_info, str):
+    if not version:
         # Malformed request, return as-is
-        return path_info
-
-    scheme, path, version = path_info
+        return path
 
     # Determine path color based on configured patterns
-    path_color = Colors.RESET  # Default color
+    path_color = RESET  # Default color
 
-    # Check for special path patterns
-    for pattern in SPECIAL_PATH_PATTERNS:
-        if pattern in path:
-            path_color = Colors.DARK_ORANGE
-            break
-
-    # Check for image extensions (takes precedence over special patterns)
-    if path.lower().endswith(IMAGE_EXTENSIONS):
-        path_color = Colors.DARK_PURPLE
+    # Check for special path patterns (single-pass automaton when available)
+    if PATH_AUTOMATON is not None:
+        if next(PATH_AUTOMATON.iter(path), None) is not None:
+            path_color = DARK_ORANGE
+    else:
+        for pattern in SPECIAL_PATH_PATTERNS:
+            if pattern in path:
+                path_color = DARK_ORANGE
+                break
+
+    # Check for image extensions (takes precedence over special patterns).
+    # Only the extension is lowercased, not the whole path, and query strings
+    # are ignored so /img.png?v=3 still matches.
+    q = path.find('?')
+    tail = path[:q] if q >= 0 else path
+    dot = tail.rfind('.')
+    if dot >= 0 and tail[dot:].lower() in IMAGE_EXT_SET:
+        path_color = DARK_PURPLE
 
     # Build colorized path
-    colorized = f"{scheme}{path_color}{path}{Colors.RESET}"
+    colorized = f"{scheme}{path_color}{path}{RESET}"
 
     # Only append version if it's not HTTP/2.0 (the common case)
     if version != "HTTP/2.0":
@@ -248,138 +321,530 @@ def colorize_path(path_info):
 
     return colorized
 
+def _parse_combined(line):
+    """Fast hand-written splitter for the combined format.
+
+    Returns the same 8-tuple as COMBINED_PATTERN's match.groups(), or None if
+    the line doesn't parse cleanly (caller falls back to the regex).
+    """
+    # $remote_addr - $remote_user
+    i = line.find(' ')
+    if i <= 0 or line[i:i + 3] != ' - ':
+        return None
+    remote_addr = line[:i]
+    j = line.find(' ', i + 3)
+    if j <= i + 3:
+        return None
+    remote_user = line[i + 3:j]
+
+    # [$time_local]
+    if line[j + 1:j + 2] != '[':
+        return None
+    k = line.find(']', j + 2)
+    if k <= j + 2:
+        return None
+    timestamp = line[j + 2:k]
+
+    # "$request"
+    if line[k + 1:k + 3] != ' "':
+        return None
+    q = line.find('"', k + 3)
+    if q < 0 or line[q + 1:q + 2] != ' ':
+        return None
+    request = line[k + 3:q]
+
+    # $status $body_bytes_sent
+    s = line.find(' ', q + 2)
+    if s < 0:
+        return None
+    status = line[q + 2:s]
+    if not status.isdigit():
+        return None
+    b = line.find(' ', s + 1)
+    if b <= s + 1:
+        return None
+    body_bytes_sent = line[s + 1:b]
+
+    # "$http_referer" "$http_user_agent"
+    if line[b + 1:b + 2] != '"':
+        return None
+    r = line.find('"', b + 2)
+    if r < 0 or line[r + 1:r + 3] != ' "':
+        return None
+    referer = line[b + 2:r]
+    u = line.find('"', r + 3)
+    if u < 0:
+        return None
+    user_agent = line[r + 3:u]
+
+    return remote_addr, remote_user, timestamp, request, status, body_bytes_sent, referer, user_agent
+
+def _parse_custom(line):
+    """Fast hand-written splitter for the custom format.
+
+    Returns the same 8-tuple as CUSTOM_PATTERN's match.groups(), or None if
+    the line doesn't parse cleanly (caller falls back to the regex).
+    """
+    # [$time_local]
+    k = line.find(']', 1)
+    if k <= 1:
+        return None
+    timestamp = line[1:k]
+
+    # $server_name | $remote_addr |
+    if line[k + 1:k + 2] != ' ':
+        return None
+    # Doubled-up separator padding would otherwise leak into these two
+    # fields and break exact IP/hostname matching; strip() returns the
+    # same object when there is nothing to remove, so clean lines pay
+    # no copy
+    p1 = line.find(' | ', k + 2)
+    if p1 <= k + 2:
+        return None
+    server_name = line[k + 2:p1].strip()
+    if not server_name:
+        return None
+    p2 = line.find(' | ', p1 + 3)
+    if p2 <= p1 + 3:
+        return None
+    remote_addr = line[p1 + 3:p2].strip()
+    if not remote_addr:
+        return None
+
+    # $status [$upstream_cache_status]
+    s = line.find(' ', p2 + 3)
+    if s < 0:
+        return None
+    status = line[p2 + 3:s]
+    if not status.isdigit():
+        return None
+    if line[s + 1:s + 2] != '[':
+        return None
+    c = line.find(']', s + 2)
+    if c <= s + 2:
+        return None
+    cache_status = line[s + 2:c]
+
+    # ${scheme_if_http}$request | Ref: "$http_referer" UA: "$http_user_agent"
+    if line[c + 1:c + 2] != ' ':
+        return None
+    sep = line.find(' | Ref: "', c + 2)
+    if sep < 0:
+        return None
+    request = line[c + 2:sep]
+    rq = line.find('" UA: "', sep + 9)
+    if rq < 0:
+        return None
+    referer = line[sep + 9:rq]
+    end = line.rfind('"')
+    if end < rq + 7 or line[end + 1:].strip():
+        return None
+    user_agent = line[rq + 7:end]
+
+    return timestamp, server_name, remote_addr, status, cache_status, request, referer, user_agent
+
 def detect_format(line):
-    """Detect which log format is being used. Returns ('combined', match) or ('custom', match) or (None, None)."""
-    # Try custom format first (more specific)
-    match = CUSTOM_PATTERN.match(line)
-    if match:
-        return 'custom', match
+    """Detect which log format is being used. Returns ('combined', fields) or ('custom', fields) or (None, None)."""
+    # Cheap prefix dispatch: custom format starts with the bracketed
+    # timestamp, so each line runs at most one parser and one fallback
+    # pattern (CUSTOM_PATTERN can never match a line not starting with '[')
+    if line[:1] == '[':
+        fields = _parse_custom(line)
+        if fields:
+            return 'custom', fields
+
+        # Regex fallback for lines the fast splitter rejects
+        match = _fallback_patterns()[1].match(line)
+        if match:
+            return 'custom', match.groups()
+    else:
+        fields = _parse_combined(line)
+        if fields:
+            return 'combined', fields
 
-    # Try combined format
-    match = COMBINED_PATTERN.match(line)
-    if match:
-        return 'combined', match
+        match = _fallback_patterns()[0].match(line)
+        if match:
+            return 'combined', match.groups()
 
     return None, None
 
-def colorize_log_line(line, show_referer=True, show_ua=True, ip_width=IP_WIDTH_IPV4, pre_match=None, pre_format=None, my_ip=None, author_ips=None):
-    """Colorize a single nginx log line (supports both combined and custom formats)."""
+def build_line_templates(show_referer, show_ua, ip_width=IP_WIDTH_IPV4):
+    """Pre-build %-format output templates for the combined and custom formats.
 
-    # Detect format if not already done
-    if pre_match is not None and pre_format is not None:
-        log_format = pre_format
-        match = pre_match
-    else:
-        log_format, match = detect_format(line)
-
-    if not match:
-        # If line doesn't match any format, return it as-is
-        return line
-
-    # Parse based on format
-    if log_format == 'combined':
-        # combined format: $remote_addr - $remote_user [$time_local] "$request" $status $body_bytes_sent "$http_referer" "$http_user_agent"
-        remote_addr, remote_user, timestamp, request, status, body_bytes_sent, referer, user_agent = match.groups()
-        server_name = None
-        cache_status = None
-    else:  # custom format
-        # custom format: [$time_local] $server_name | $remote_addr | $status [$upstream_cache_status] ${scheme_if_http}$request | Ref: "$http_referer" UA: "$http_user_agent"
-        timestamp, server_name, remote_addr, status, cache_status, request, referer, user_agent = match.groups()
-        cache_status = cache_status.strip() if cache_status else None
-
-    # Right-align fields for column alignment
-    timestamp_formatted = f"[{timestamp}]".ljust(TIMESTAMP_WIDTH)  # Left-align timestamp (it's consistent)
-
-    # Format IP address - left-aligned
-    ip_addr = remote_addr.strip()
-    ip_formatted = ip_addr.ljust(ip_width)
-
-    # Determine IP color with priority: my_ip > author_ips > special servers > default
-    if my_ip and ip_addr == my_ip:
-        ip_color = Colors.BRIGHT_YELLOW
-    elif author_ips and ip_addr in author_ips:
-        ip_color = Colors.DARK_GREEN
-    elif ip_addr in SPECIAL_SERVER_IPS:
-        ip_color = Colors.ORANGE
+    The color prefixes, separators, and column widths are constant for a
+    given set of flags, so they are baked into the template once per run
+    (padding becomes part of the single C-level % operation); per line only
+    the variable slots (timestamp, IP, method, status, path, ...) are
+    filled in. The method slot is pre-padded by the caller because it
+    contains escape codes that would confuse a width specifier.
+    """
+    if show_referer and show_ua:
+        tail = f' {DARK_GRAY}Ref: "%s" UA: "%s"{RESET}'
+    elif show_referer:
+        tail = f' {DARK_GRAY}Ref: "%s"{RESET}'
+    elif show_ua:
+        tail = f' {DARK_GRAY}UA: "%s"{RESET}'
     else:
-        ip_color = Colors.BRIGHT_CYAN
-
-    # Parse request into method and path components
-    method, path_info = parse_request(request)
-
-    status_formatted = status.rjust(STATUS_WIDTH)
+        tail = ''
+
+    # RESET is only emitted where it matters: after the status (whose 404/5xx
+    # colors set a background that must not bleed into the separator), after
+    # the cache column (the path may lead with an uncolored scheme), and at
+    # end of line. Foreground-only fields just switch straight to the next
+    # field's color, trimming ~4 escape sequences per line.
+
+    # Slots: timestamp, ip color, ip, method, status color, status, path
+    combined = (
+        f'{DARK_GRAY}%-{TIMESTAMP_WIDTH}s '
+        f'%s%-{ip_width}s '
+        '%s '
+        f'%s%{STATUS_WIDTH}s{RESET} '
+        '%s'
+        + tail
+    )
 
-    # Build base colorized line with aligned columns
-    colorized = (
-        f"{Colors.DARK_GRAY}{timestamp_formatted}{Colors.RESET} "
+    # Slots: timestamp, server name, ip color, ip, method, status color,
+    # status, cache color, cache, path
+    custom = (
+        f'{DARK_GRAY}%-{TIMESTAMP_WIDTH}s '
+        f'{CYAN}%{HOSTNAME_WIDTH}s  '
+        f'%s%-{ip_width}s '
+        '%s '
+        f'%s%{STATUS_WIDTH}s{RESET} '
+        f'%s%s{RESET} '
+        '%s'
+        + tail
     )
 
-    # Add server name if available (custom format only)
-    if server_name:
-        hostname_formatted = server_name.strip().rjust(HOSTNAME_WIDTH)
-        colorized += f"{Colors.CYAN}{hostname_formatted}{Colors.RESET}  "
+    return combined, custom
+
+def make_line_colorizer(show_referer=True, show_ua=True, ip_width=IP_WIDTH_IPV4, ip_colors=None, templates=None):
+    """Specialize the line colorizer for a fixed flag combination.
+
+    All per-run constants — templates, IP color table, column widths, which
+    optional tail fields to emit — are resolved once here, so the returned
+    closure carries no flag defaults or keyword arguments in the per-line
+    hot path (partial evaluation of the configuration).
+    """
+    if templates is None:
+        templates = build_line_templates(show_referer, show_ua, ip_width)
+    template_combined, template_custom = templates
+    if ip_colors is None:
+        ip_colors = DEFAULT_IP_COLORS
+    ip_color_get = ip_colors.get
+    status_color_get = STATUS_COLOR_FULL.get
+    cache_display_get = CACHE_DISPLAY_MAP.get
+    tail_both = show_referer and show_ua
+
+    def colorize(line, pre_match=None, pre_format=None):
+        """Colorize a single nginx log line (supports both combined and custom formats)."""
+        # Detect format if not already done
+        if pre_match is not None and pre_format is not None:
+            log_format = pre_format
+            fields = pre_match
+        else:
+            log_format, fields = detect_format(line)
+
+        if not fields:
+            # If line doesn't match any format, return it as-is
+            return line
+
+        # Parse based on format
+        if log_format == 'combined':
+            # combined format: $remote_addr - $remote_user [$time_local] "$request" $status $body_bytes_sent "$http_referer" "$http_user_agent"
+            remote_addr, remote_user, timestamp, request, status, body_bytes_sent, referer, user_agent = fields
+            server_name = None
+            cache_status = None
+        else:  # custom format
+            # custom format: [$time_local] $server_name | $remote_addr | $status [$upstream_cache_status] ${scheme_if_http}$request | Ref: "$http_referer" UA: "$http_user_agent"
+            timestamp, server_name, remote_addr, status, cache_status, request, referer, user_agent = fields
+            cache_status = cache_status.strip() if cache_status else None
+
+        # Determine IP color (priority is baked into the lookup table)
+        ip_color = ip_color_get(remote_addr, BRIGHT_CYAN)
+
+        # Parse request into method and path components
+        method, scheme, path, version = parse_request(request)
+
+        # Pad the method on its raw length: the colorized string contains
+        # escape codes, so ljust on it would never actually pad
+        method_formatted = colorize_method(method)
+        method_pad = METHOD_WIDTH - len(method)
+        if method_pad > 0:
+            method_formatted += ' ' * method_pad
+
+        # Fill the per-format template; column padding is part of the
+        # template's width specifiers
+        if server_name:
+            # custom format: server name and cache status columns included
+            cache_color, cache_formatted = cache_display_get(cache_status, CACHE_DISPLAY_DEFAULT)
+            values = (
+                '[' + timestamp + ']', server_name, ip_color, remote_addr,
+                method_formatted,
+                status_color_get(status, STATUS_OTHER), status,
+                cache_color, cache_formatted,
+                colorize_path(scheme, path, version),
+            )
+            template = template_custom
+        else:
+            values = (
+                '[' + timestamp + ']', ip_color, remote_addr,
+                method_formatted,
+                status_color_get(status, STATUS_OTHER), status,
+                colorize_path(scheme, path, version),
+            )
+            template = template_combined
+
+        # Append the optional slots to match the tail baked into the template
+        if tail_both:
+            values += (referer, user_agent)
+        elif show_referer:
+            values += (referer,)
+        elif show_ua:
+            values += (user_agent,)
+
+        return template % values
+
+    return colorize
+
+def colorize_log_line(line, show_referer=True, show_ua=True, ip_width=IP_WIDTH_IPV4, pre_match=None, pre_format=None, ip_colors=None, templates=None):
+    """Colorize a single nginx log line (convenience wrapper).
+
+    Builds a one-off specialization; the streaming loop in main() calls
+    make_line_colorizer directly so the setup cost is paid once per run.
+    """
+    colorize = make_line_colorizer(show_referer, show_ua, ip_width, ip_colors, templates)
+    return colorize(line, pre_match, pre_format)
+
+def _process_line(line, colorize, ipv4_only, ipv6_only):
+    """Filter (optionally) and colorize one line.
+
+    Returns the output string, the original line for unparseable input
+    (echoed untouched only when no filter is active), or None when the
+    -4/-6 filter drops the line. Shared by the sequential loop and the
+    parallel batch workers.
+    """
+    if ipv4_only or ipv6_only:
+        # Cheap position peeks reject most lines before any parsing
+        if line[:1] != '[':
+            # Combined format leads with the IP
+            if ipv4_only and not is_ipv4(line):
+                return None
+            if ipv6_only and not is_ipv6(line):
+                return None
+        else:
+            # Custom format: the IP sits right after the first ' | '
+            p1 = line.find(' | ')
+            if p1 >= 0:
+                ip_start = p1 + 3
+                # The parsers tolerate separator padding, so the peek
+                # must skip the same padding or it would drop lines the
+                # parse-and-confirm step below accepts
+                while line[ip_start:ip_start + 1] == ' ':
+                    ip_start += 1
+                if ipv4_only and not is_ipv4(line[ip_start:ip_start + 4]):
+                    return None
+                if ipv6_only and not is_ipv6(line[ip_start:ip_start + 5]):
+                    return None
+
+        log_format, fields = detect_format(line)
+        if not fields:
+            # No IP to test against, so an active filter drops the line —
+            # the same verdict the prefix peek gives garbage it rejects
+            return None
+
+        # Confirm against the parsed field (different positions per format)
+        ip_addr = fields[0] if log_format == 'combined' else fields[2]
+        if ipv4_only and not is_ipv4(ip_addr):
+            return None
+        if ipv6_only and not is_ipv6(ip_addr):
+            return None
+        return colorize(line, fields, log_format)
+
+    return colorize(line)
+
+# Per-process state for parallel batch mode, set by _init_batch_worker
+_WORKER_COLORIZE = None
+_WORKER_FILTER = (False, False)
+
+def _init_batch_worker(show_referer, show_ua, ip_width, ip_colors, ipv4_only, ipv6_only):
+    """Build the specialized colorizer once per worker process."""
+    global _WORKER_COLORIZE, _WORKER_FILTER
+    _WORKER_COLORIZE = make_line_colorizer(show_referer, show_ua, ip_width, ip_colors)
+    _WORKER_FILTER = (ipv4_only, ipv6_only)
+
+def _colorize_chunk(chunk):
+    """Worker: colorize one newline-delimited bytes chunk into output bytes."""
+    colorize = _WORKER_COLORIZE
+    ipv4_only, ipv6_only = _WORKER_FILTER
+    out = bytearray()
+    for raw_line in chunk.split(b'\n'):
+        result = _process_line(raw_line.decode('utf-8', 'replace'), colorize, ipv4_only, ipv6_only)
+        if result is not None:
+            out += result.encode('utf-8')
+            out += b'\n'
+    return bytes(out)
+
+def _iter_batch_chunks(raw, chunk_size=1024 * 1024):
+    """Yield newline-delimited bytes chunks cut at line boundaries."""
+    leftover = b''
+    while True:
+        block = raw.read(chunk_size)
+        if not block:
+            break
+        block = leftover + block
+        cut = block.rfind(b'\n')
+        if cut < 0:
+            leftover = block
+            continue
+        yield block[:cut]
+        leftover = block[cut + 1:]
+    if leftover:
+        yield leftover
+
+def _write_stdout_bytes(buf):
+    """Write a bytes buffer straight to stdout, retrying partial writes.
+
+    os.write skips the TextIOWrapper/BufferedWriter layers entirely; only
+    used in batch mode where nothing else touches sys.stdout.
+    """
+    view = memoryview(buf)
+    while view:
+        written = os.write(1, view)
+        view = view[written:]
+
+def _iter_batch_lines(raw, block_size=64 * 1024):
+    """Yield decoded lines from large block reads of a binary stream.
+
+    Bypasses TextIOWrapper's per-line decode/newline search: each 64KB block
+    is split on b'\\n' and decoded in bulk. Only used in batch mode, where
+    input latency doesn't matter.
+    """
+    leftover = b''
+    while True:
+        chunk = raw.read(block_size)
+        if not chunk:
+            break
+        parts = (leftover + chunk).split(b'\n')
+        leftover = parts.pop()
+        for raw_line in parts:
+            yield raw_line.decode('utf-8', 'replace')
+    if leftover:
+        yield leftover.decode('utf-8', 'replace')
 
-    colorized += (
-        f"{ip_color}{ip_formatted}{Colors.RESET} "
-        f"{colorize_method(method).ljust(METHOD_WIDTH)} "
-        f"{get_status_color(status)}{status_formatted}{Colors.RESET} "
-    )
+USAGE = 'usage: colorize-nginx-logs.py [-h] [-short] [-shortshort] [-4] [-6] [-m IP] [-a IP]'
 
-    # Add cache status if available (custom format only)
-    if cache_status is not None:
-        cache_formatted = f"[{get_cache_abbrev(cache_status)}]"
-        colorized += f"{get_cache_color(cache_status)}{cache_formatted}{Colors.RESET} "
+HELP = USAGE + """
 
-    colorized += f"{colorize_path(path_info)}"
+Colorize nginx logs with column alignment
 
-    # Add optional fields based on flags
-    if show_referer and show_ua:
-        colorized += f" {Colors.DARK_GRAY}Ref: \"{referer}\" UA: \"{user_agent}\"{Colors.RESET}"
-    elif show_referer:
-        colorized += f" {Colors.DARK_GRAY}Ref: \"{referer}\"{Colors.RESET}"
-    elif show_ua:
-        colorized += f" {Colors.DARK_GRAY}UA: \"{user_agent}\"{Colors.RESET}"
+Options:
+  -short              Suppress referrer output
+  -shortshort         Suppress both referrer and user agent output
+  -4                  Display only IPv4 requests
+  -6                  Display only IPv6 requests
+  --my-ip, -m IP      Highlight your IP address in bright yellow
+  --author-ip, -a IP  Highlight post author IP in bright green (can be used multiple times, max 4)
+  -h, --help          Show this help message and exit
 
-    return colorized
+Examples:
+  tail -f /var/log/nginx/access.log | colorize-nginx-logs.py
+  tail -f /var/log/nginx/access.log | colorize-nginx-logs.py -short
+  tail -f /var/log/nginx/access.log | colorize-nginx-logs.py -shortshort
+  tail -f /var/log/nginx/access.log | colorize-nginx-logs.py -4
+  tail -f /var/log/nginx/access.log | colorize-nginx-logs.py -6
+  tail -f /var/log/nginx/access.log | colorize-nginx-logs.py -6 -shortshort
+  tail -f /var/log/nginx/access.log | colorize-nginx-logs.py -m 1.2.3.4
+  tail -f /var/log/nginx/access.log | colorize-nginx-logs.py -m 1.2.3.4 -a 5.6.7.8 -a 9.10.11.12
+"""
+
+class _Args:
+    """Parsed command-line options (plain attribute bag)."""
+
+    def __init__(self):
+        self.short = False
+        self.shortshort = False
+        self.ipv4_only = False
+        self.ipv6_only = False
+        self.my_ip = None
+        self.author_ips = None
+
+def _cli_error(message):
+    sys.stderr.write(USAGE + '\n' + 'error: ' + message + '\n')
+    sys.exit(2)
+
+_LONG_OPTS = ('--help', '--my-ip', '--author-ip')
+
+def _canon_long_opt(arg):
+    """Expand an unambiguous long-option prefix, like argparse does.
+
+    `--my 1.2.3.4` and `--author X` were valid under argparse and must
+    stay valid here.
+    """
+    name, sep, value = arg.partition('=')
+    matches = [opt for opt in _LONG_OPTS if opt.startswith(name)]
+    if len(matches) == 1:
+        return matches[0] + sep + value
+    if len(matches) > 1:
+        _cli_error('ambiguous option: %s could match %s'
+                   % (name, ', '.join(matches)))
+    return arg
+
+def parse_args(argv):
+    """Parse command-line flags in a single pass over argv.
+
+    Hand-rolled instead of argparse: the accepted CLI is unchanged
+    (including unambiguous long-option prefixes) but the import and
+    parser construction drop off the cold-start path, which matters for
+    short `cat small.log | colorize` runs.
+    """
+    args = _Args()
+    i = 0
+    n = len(argv)
+    while i < n:
+        arg = argv[i]
+        if len(arg) > 2 and arg[:2] == '--':
+            arg = _canon_long_opt(arg)
+        if arg == '-short':
+            args.short = True
+        elif arg == '-shortshort':
+            args.shortshort = True
+        elif arg == '-4':
+            args.ipv4_only = True
+        elif arg == '-6':
+            args.ipv6_only = True
+        elif arg in ('-h', '--help'):
+            sys.stdout.write(HELP)
+            sys.exit(0)
+        elif arg in ('-m', '--my-ip'):
+            i += 1
+            if i >= n:
+                _cli_error('argument --my-ip/-m: expected one argument')
+            args.my_ip = argv[i]
+        elif arg.startswith('--my-ip='):
+            args.my_ip = arg[len('--my-ip='):]
+        elif arg in ('-a', '--author-ip'):
+            i += 1
+            if i >= n:
+                _cli_error('argument --author-ip/-a: expected one argument')
+            args.author_ips = (args.author_ips or []) + [argv[i]]
+        elif arg.startswith('--author-ip='):
+            args.author_ips = (args.author_ips or []) + [arg[len('--author-ip='):]]
+        else:
+            _cli_error('unrecognized argument: ' + arg)
+        i += 1
+    return args
 
 def main():
     """Read from stdin and colorize each line."""
-    parser = argparse.ArgumentParser(
-        description='Colorize nginx logs with column alignment',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  tail -f /var/log/nginx/access.log | %(prog)s
-  tail -f /var/log/nginx/access.log | %(prog)s -short
-  tail -f /var/log/nginx/access.log | %(prog)s -shortshort
-  tail -f /var/log/nginx/access.log | %(prog)s -4
-  tail -f /var/log/nginx/access.log | %(prog)s -6
-  tail -f /var/log/nginx/access.log | %(prog)s -6 -shortshort
-  tail -f /var/log/nginx/access.log | %(prog)s -m 1.2.3.4
-  tail -f /var/log/nginx/access.log | %(prog)s -m 1.2.3.4 -a 5.6.7.8 -a 9.10.11.12
-        """
-    )
-    parser.add_argument('-short', action='store_true',
-                       help='Suppress referrer output')
-    parser.add_argument('-shortshort', action='store_true',
-                       help='Suppress both referrer and user agent output')
-    parser.add_argument('-4', dest='ipv4_only', action='store_true',
-                       help='Display only IPv4 requests')
-    parser.add_argument('-6', dest='ipv6_only', action='store_true',
-                       help='Display only IPv6 requests')
-    parser.add_argument('--my-ip', '-m', dest='my_ip',
-                       help='Highlight your IP address in bright yellow')
-    parser.add_argument('--author-ip', '-a', dest='author_ips', action='append',
-                       help='Highlight post author IP in bright green (can be used multiple times, max 4)')
-
-    args = parser.parse_args()
+    args = parse_args(sys.argv[1:])
 
     # Validate author IPs count
     if args.author_ips and len(args.author_ips) > 4:
-        parser.error('Maximum 4 author IPs allowed')
+        _cli_error('Maximum 4 author IPs allowed')
 
-    # Convert author_ips to a set for faster lookup, or None if not provided
-    author_ips_set = set(args.author_ips) if args.author_ips else None
+    # Merge all IP highlight rules into one lookup table
+    ip_colors = build_ip_colors(args.my_ip, args.author_ips)
 
     # Determine what to show based on flags
     show_referer = not args.short and not args.shortshort
@@ -388,46 +853,72 @@ Examples:
     # Determine IP width based on IPv6 filter
     ip_width = IP_WIDTH_IPV6 if args.ipv6_only else IP_WIDTH_IPV4
 
+    # Specialize the colorizer for this flag combination (templates and
+    # lookup tables are bound once, up front)
+    colorize = make_line_colorizer(show_referer, show_ua, ip_width, ip_colors)
+
+    # Batch mode: stdin redirected from a regular file means no one is
+    # watching in real time, so coalesce output into large writes instead of
+    # one syscall per line. Pipes (tail -f) keep the line-buffered behavior.
+    try:
+        batch_mode = stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode)
+    except (OSError, ValueError):
+        batch_mode = False
+
+    # Large files in batch mode fan out across cores: colorization is
+    # embarrassingly parallel per line, and imap preserves output order
+    try:
+        parallel = (batch_mode
+                    and (os.cpu_count() or 1) > 1
+                    and os.fstat(sys.stdin.fileno()).st_size >= PARALLEL_MIN_BYTES)
+    except OSError:
+        parallel = False
+
+    ipv4_only = args.ipv4_only
+    ipv6_only = args.ipv6_only
+
     try:
-        try:
-            sys.stdout.reconfigure(line_buffering=True)
-        except AttributeError:
-            pass
-        ipv4_only = args.ipv4_only
-        ipv6_only = args.ipv6_only
-        detect = detect_format
-        colorize = colorize_log_line
+        if parallel:
+            # Imported here so tail -f pipelines and small files never pay
+            # the ~13 ms module cost at startup
+            import multiprocessing
+
+            initargs = (show_referer, show_ua, ip_width, ip_colors, ipv4_only, ipv6_only)
+            with multiprocessing.Pool(initializer=_init_batch_worker, initargs=initargs) as pool:
+                for out_bytes in pool.imap(_colorize_chunk, _iter_batch_chunks(sys.stdin.buffer), chunksize=4):
+                    _write_stdout_bytes(out_bytes)
+            return
+
+        if not batch_mode:
+            try:
+                sys.stdout.reconfigure(line_buffering=True)
+            except AttributeError:
+                pass
+        out_buf = bytearray()
         write = sys.stdout.write
-        for line in sys.stdin:
-            # Remove trailing newline
+        process = _process_line
+        # Batch mode reads big blocks; follow mode keeps per-line latency
+        lines = _iter_batch_lines(sys.stdin.buffer) if batch_mode else sys.stdin
+        for line in lines:
+            # Remove trailing newline (batched lines arrive without one)
             line = line.rstrip('\n')
 
-            # Filter by IP version if requested
-            if ipv4_only or ipv6_only:
-                # Extract IP address from log line to filter
-                log_format, match = detect(line)
-                if match:
-                    # Get IP address based on format (different group positions)
-                    if log_format == 'combined':
-                        ip_addr = match.group(1).strip()  # remote_addr is group 1 in combined
-                    else:  # custom
-                        ip_addr = match.group(3).strip()  # remote_addr is group 3 in custom
-
-                    # Skip this line if it doesn't match the filter
-                    if ipv4_only and not is_ipv4(ip_addr):
-                        continue
-                    if ipv6_only and not is_ipv6(ip_addr):
-                        continue
-                else:
-                    write(line + "\n")
-                    continue
-
-            # Colorize and print
-            colorized = colorize(line, show_referer=show_referer, show_ua=show_ua, ip_width=ip_width,
-                               pre_match=match if (ipv4_only or ipv6_only) else None,
-                               pre_format=log_format if (ipv4_only or ipv6_only) else None,
-                               my_ip=args.my_ip, author_ips=author_ips_set)
-            write(colorized + "\n")
+            # Filter (optional) and colorize; None means filtered out
+            colorized = process(line, colorize, ipv4_only, ipv6_only)
+            if colorized is None:
+                continue
+            if batch_mode:
+                out_buf += colorized.encode('utf-8')
+                out_buf += b'\n'
+                if len(out_buf) >= BATCH_BYTES:
+                    _write_stdout_bytes(out_buf)
+                    out_buf.clear()
+            else:
+                write(colorized + "\n")
+
+        # Flush whatever is left in the batch buffer
+        if out_buf:
+            _write_stdout_bytes(out_buf)
     except KeyboardInterrupt:
         # Handle Ctrl+C gracefully
         pass
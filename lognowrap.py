@@ -51,23 +51,53 @@ This tool does ONE thing: display already-formatted ANSI text without wrapping.
 It does NOT parse logs, colorize output, or modify input in any way.
 """
 
+import bisect
 import collections
 import fcntl
+import functools
 import os
+import re
 import selectors
 import signal
 import sys
 import termios
+import time
 import tty
 import unicodedata
 
-try:
-    import wcwidth  # type: ignore
-except Exception:
-    wcwidth = None
+def _load_wcwidth():
+    # Fastest first: a compiled extension, then libc's wcwidth(3) via
+    # ctypes, then the pure-Python wcwidth package. The libc shim is only
+    # trusted if the locale actually classifies wide characters (in the
+    # default C locale wcwidth(3) reports -1 for all non-ASCII).
+    try:
+        from wcwidth_cext import wcwidth  # type: ignore
+        return wcwidth
+    except Exception:
+        pass
+    try:
+        import ctypes
+        import locale
+        locale.setlocale(locale.LC_CTYPE, "")
+        libc = ctypes.CDLL("libc.so.6")
+        libc.wcwidth.argtypes = [ctypes.c_wchar]
+        libc.wcwidth.restype = ctypes.c_int
+        if libc.wcwidth("一") == 2:
+            return libc.wcwidth
+    except Exception:
+        pass
+    try:
+        from wcwidth import wcwidth  # type: ignore
+        return wcwidth
+    except Exception:
+        return None
+
+
+_wcwidth_fn = _load_wcwidth()
 
-ESC = "\x1b"
+ESC = b"\x1b"
 MAX_LINE_BYTES = 1024 * 1024  # Safety cap for malformed or unbounded input.
+FRAME_INTERVAL = 1 / 60  # Coalesce redraws to roughly terminal refresh rate.
 
 
 def _set_nonblocking(fd):
@@ -75,181 +105,335 @@ def _set_nonblocking(fd):
     fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
 
 
-def _consume_ansi(line, start):
-    if start + 1 >= len(line):
-        return line[start], start + 1
-    nxt = line[start + 1]
-    if nxt == "[":
-        i = start + 2
-        while i < len(line):
-            c = line[i]
-            if "@" <= c <= "~":
-                i += 1
-                return line[start:i], i
-            i += 1
-        return line[start:], len(line)
-    if nxt == "]":
-        i = start + 2
-        while i < len(line):
-            if line[i] == "\x07":
-                i += 1
-                return line[start:i], i
-            if line[i] == ESC and i + 1 < len(line) and line[i + 1] == "\\":
-                i += 2
-                return line[start:i], i
-            i += 1
-        return line[start:], len(line)
-    if nxt in "()#%":
-        if start + 2 < len(line):
-            return line[start:start + 3], start + 3
-        return line[start:], len(line)
-    return line[start:start + 2], start + 2
-
-
-def _iter_tokens(line):
-    i = 0
-    while i < len(line):
-        if line[i] == ESC:
-            seq, i = _consume_ansi(line, i)
-            yield True, seq
-        else:
-            yield False, line[i]
-            i += 1
+# One alternative per escape family: CSI (params then a final byte), OSC
+# (terminated by BEL or ST), charset designation, and two-byte escapes.
+# Trailing "?" markers keep truncated sequences at end-of-line matching,
+# and the bare "." alternative swallows a lone trailing ESC. The pattern
+# is bytes: UTF-8 continuation bytes never collide with ESC, so lines can
+# be tokenized without decoding them.
+# One full UTF-8 sequence (or a single invalid byte), so that a malformed
+# escape never swallows half of a multi-byte character.
+_UTF8_CHAR = (
+    b"(?:[\\x00-\\x7f]"
+    b"|[\\xc2-\\xdf][\\x80-\\xbf]"
+    b"|[\\xe0-\\xef][\\x80-\\xbf]{2}"
+    b"|[\\xf0-\\xf4][\\x80-\\xbf]{3}"
+    b"|.)"
+)
+_ANSI_RE = re.compile(
+    b"\x1b(?:"
+    b"\\[[^@-~]*[@-~]?"
+    b"|\\](?:[^\x07\x1b]|\x1b(?!\\\\))*(?:\x07|\x1b\\\\)?"
+    b"|[()#%]" + _UTF8_CHAR + b"?"
+    b"|" + _UTF8_CHAR + b")?",
+    re.DOTALL,
+)
+
+
+def _iter_spans(line):
+    """Yield (is_ansi, start, end) index spans; text spans never contain ESC.
+
+    Index spans instead of substrings: callers slice out only the bytes
+    they actually use, so escape sequences whose payload is irrelevant
+    (all of visible_width) are never copied.
+    """
+    pos = 0
+    for match in _ANSI_RE.finditer(line):
+        start = match.start()
+        if start > pos:
+            yield False, pos, start
+        end = match.end()
+        yield True, start, end
+        pos = end
+    if pos < len(line):
+        yield False, pos, len(line)
+
+
+# Widths of the 128 ASCII codepoints: controls and DEL occupy no columns.
+_ASCII_WIDTH = [1] * 128
+_ASCII_WIDTH[0:0x20] = [0] * 0x20
+_ASCII_WIDTH[0x7f] = 0
+
+
+@functools.lru_cache(maxsize=4096)
+def _char_width_slow(ch):
+    if _wcwidth_fn is not None:
+        width = _wcwidth_fn(ch)
+        return 0 if width < 0 else width
+    if ord(ch) < 0xa0:
+        return 0  # C1 controls
+    if unicodedata.combining(ch) or unicodedata.category(ch) == "Cf":
+        return 0
+    east = unicodedata.east_asian_width(ch)
+    return 2 if east in ("W", "F") else 1
 
 
 def _char_width(ch):
-    if wcwidth is None:
-        code = ord(ch)
-        if code < 0x20 or (0x7f <= code < 0xa0):
-            return 0
-        if unicodedata.combining(ch) or unicodedata.category(ch) == "Cf":
-            return 0
-        east = unicodedata.east_asian_width(ch)
-        return 2 if east in ("W", "F") else 1
-    width = wcwidth.wcwidth(ch)
-    return 0 if width < 0 else width
+    code = ord(ch)
+    if code < 0x80:
+        return _ASCII_WIDTH[code]
+    return _char_width_slow(ch)
+
+
+# ASCII bytes that occupy no columns; deleting them from an ASCII span
+# with bytes.translate leaves exactly one byte per column.
+_ZERO_WIDTH_ASCII = bytes(range(0x20)) + b"\x7f"
+
+# The zero-width codepoints that actually show up in practice: combining
+# diacritics, zero-width spaces/joiners, bidi marks, variation selectors
+# and the BOM. Deleting them with one translate call keeps them out of
+# the per-character width loop; rarer zero-width marks still land in
+# _char_width, which reports them as zero columns.
+_ZERO_WIDTH_TRANS = str.maketrans("", "", (
+    "".join(chr(c) for c in range(0x0300, 0x0370))
+    + "\u200b\u200c\u200d\u200e\u200f\ufeff"
+    + "".join(chr(c) for c in range(0xfe00, 0xfe10))
+))
+
+
+def _span_width(span):
+    if span.isascii():
+        return len(span.translate(None, _ZERO_WIDTH_ASCII))
+    text = span.decode("utf-8", "replace").translate(_ZERO_WIDTH_TRANS)
+    width = 0
+    for ch in text:
+        width += _char_width(ch)
+    return width
 
 
 def visible_width(line):
+    # Typical log line: ASCII with no escapes; one column per byte after
+    # dropping the (normally absent) control bytes.
+    if line.isascii() and b"\x1b" not in line:
+        return len(line.translate(None, _ZERO_WIDTH_ASCII))
     width = 0
-    for is_ansi, token in _iter_tokens(line):
+    for is_ansi, start, end in _iter_spans(line):
         if is_ansi:
             continue
-        width += _char_width(token)
+        width += _span_width(line[start:end])
     return width
 
 
-def slice_ansi(line, start_col, width):
+@functools.lru_cache(maxsize=128)
+def _span_index(line):
+    """Prefix-sum index of a line's text spans for scrolled slicing.
+
+    Returns (spans, cols, idxs, plens, escapes): the tokenized span list,
+    the visible column where each text span begins, that span's position
+    in the span list, and - because the escape prefix a resumed walk needs
+    is always a prefix of the concatenation of all earlier escapes - one
+    joined escape blob plus the length of it that applies at each
+    breakpoint, instead of a quadratic list of prefix copies.
+    """
+    spans = tuple(_iter_spans(line))
+    cols = []
+    idxs = []
+    plens = []
+    escape_parts = []
+    col = 0
+    escapes_len = 0
+    for i, (is_ansi, start, end) in enumerate(spans):
+        if is_ansi:
+            escape_parts.append(line[start:end])
+            escapes_len += end - start
+        else:
+            cols.append(col)
+            idxs.append(i)
+            plens.append(escapes_len)
+            col += _span_width(line[start:end])
+    return spans, cols, idxs, plens, b"".join(escape_parts)
+
+
+# Scrolling one column re-slices every visible line against an unchanged
+# width, and a full redraw re-slices lines that were already on screen, so
+# redraws are dominated by repeat calls. Lines are immutable bytes, which
+# makes content-keyed memoization safe. The LRU bound counts entries, not
+# bytes, and each entry can pin a whole line (up to MAX_LINE_BYTES), so it
+# is kept to a screenful or two: enough for every visible line even on a
+# tall terminal, small enough that scrolled-off lines are released quickly.
+@functools.lru_cache(maxsize=128)
+def slice_ansi(line, start_col, width, line_width=None):
     if width <= 0:
-        return ""
+        return b""
+    if line_width is not None and line_width <= start_col:
+        # The caller's cached width says the whole line is scrolled off to
+        # the left; nothing would survive the walk below.
+        return b""
+    if line_width is not None and 0 < line_width <= width and start_col == 0:
+        # Unscrolled and the whole line fits - the dominant case during
+        # tail -f - so emit it verbatim without tokenizing. Only safe
+        # when every zero-width control byte is the ESC of an escape
+        # sequence: a stray BEL or TAB (or a line with no visible
+        # columns at all) must take the tokenized walk below, which
+        # drops leading controls instead of replaying them at the
+        # terminal.
+        if len(line) - len(line.translate(None, _ZERO_WIDTH_ASCII)) \
+                == line.count(ESC):
+            return line + _SGR_RESET
     pos = 0
     visible = 0
     started = False
-    prefix = ""
-    out = []
-    for is_ansi, token in _iter_tokens(line):
+    prefix = b""
+    out = bytearray()
+    spans_iter = None
+    if start_col > 0:
+        # Bisect the per-line prefix sums to resume the walk at the span
+        # containing start_col instead of re-measuring everything before it.
+        spans, cols, idxs, plens, escapes = _span_index(line)
+        k = bisect.bisect_right(cols, start_col) - 1
+        if k >= 0:
+            pos = cols[k]
+            prefix = escapes[:plens[k]]
+            spans_iter = spans[idxs[k]:]
+        else:
+            spans_iter = spans
+    if spans_iter is None:
+        spans_iter = _iter_spans(line)
+    for is_ansi, span_start, span_end in spans_iter:
         if is_ansi:
             if not started:
-                prefix += token
+                prefix += line[span_start:span_end]
             else:
-                out.append(token)
+                out += line[span_start:span_end]
             continue
 
-        w = _char_width(token)
-        if w <= 0:
-            if started:
-                out.append(token)
-            continue
+        span = line[span_start:span_end]
+        if not started:
+            span_width = _span_width(span)
+            if pos + span_width <= start_col:
+                # Entire span is scrolled off to the left; its zero-width
+                # characters are dropped, same as the per-char path below.
+                pos += span_width
+                continue
 
-        if pos + w <= start_col:
-            pos += w
+        if span.isascii() and len(span) == len(
+                span.translate(None, _ZERO_WIDTH_ASCII)):
+            # Printable ASCII: one column per byte, so the contribution is
+            # plain byte slicing with no per-character loop.
+            skip = start_col - pos if not started else 0
+            take = min(width - visible, len(span) - skip)
+            if not started:
+                started = True
+                if prefix:
+                    out += prefix
+            out += span[skip:skip + take]
+            pos += skip + take
+            visible += take
+            if visible >= width:
+                break
             continue
 
-        if not started:
-            started = True
-            if prefix:
-                out.append(prefix)
+        for ch in span.decode("utf-8", "replace"):
+            w = _char_width(ch)
+            if w <= 0:
+                if started:
+                    out += ch.encode("utf-8")
+                continue
 
-        out.append(token)
-        pos += w
-        visible += w
+            if pos + w <= start_col:
+                pos += w
+                continue
+
+            if not started:
+                started = True
+                if prefix:
+                    out += prefix
+
+            out += ch.encode("utf-8")
+            pos += w
+            visible += w
+            if visible >= width:
+                break
         if visible >= width:
             break
 
     if not started:
-        return ""
-    out.append(ESC + "[0m")
-    return "".join(out)
+        return b""
+    out += _SGR_RESET
+    return bytes(out)
 
 
-def render(lines, term_width, term_height, xoff, first=False):
-    out = sys.stdout
+_CLEAR = b"\x1b[2J"
+_HOME = b"\x1b[H"
+_SGR_RESET = b"\x1b[0m"
+_RESET_EL = _SGR_RESET + b"\x1b[2K"  # reset attributes, then erase the row
+_CRLF = b"\r\n"
+
+
+def render(lines, widths, term_width, term_height, xoff, first=False):
+    buf = bytearray()
     if first:
-        out.write(ESC + "[2J")
-    out.write(ESC + "[H")
+        buf += _CLEAR
+    buf += _HOME
+    last_row = term_height - 1
     for idx in range(term_height):
-        out.write(ESC + "[0m")
-        out.write(ESC + "[2K")
+        buf += _RESET_EL
         if idx < len(lines):
-            out.write(slice_ansi(lines[idx], xoff, term_width))
-        if idx < term_height - 1:
-            out.write("\r\n")
+            buf += slice_ansi(lines[idx], xoff, term_width, widths[idx])
+        if idx < last_row:
+            buf += _CRLF
+    out = sys.stdout.buffer
+    out.write(buf)
     out.flush()
 
 
-def render_incremental(line, term_width, xoff):
-    out = sys.stdout
-    out.write(ESC + "[0m")
-    out.write(ESC + "[2K")
-    out.write(slice_ansi(line, xoff, term_width))
-    out.write("\r\n")
+def render_incremental(line, line_width, term_width, xoff):
+    out = sys.stdout.buffer
+    out.write(_RESET_EL + slice_ansi(line, xoff, term_width, line_width) + _CRLF)
     out.flush()
 
 
-def parse_keys(buf):
-    actions = []
-    i = 0
-    while i < len(buf):
-        if buf[i] != 0x1b:
-            if buf[i] == 0x03:
-                actions.append("quit")
-            i += 1
-            continue
-
-        if buf.startswith(b"\x1b[C", i):
-            actions.append("right")
-            i += 3
-            continue
-        if buf.startswith(b"\x1b[D", i):
-            actions.append("left")
-            i += 3
-            continue
-        if buf.startswith(b"\x1bOC", i):
-            actions.append("right")
-            i += 3
-            continue
-        if buf.startswith(b"\x1bOD", i):
-            actions.append("left")
-            i += 3
-            continue
-
-        if i + 1 < len(buf) and buf[i + 1] == 0x5b:
-            j = i + 2
-            while j < len(buf) and not (0x40 <= buf[j] <= 0x7e):
-                j += 1
-            if j < len(buf):
-                final = buf[j:j + 1]
-                if final == b"C":
-                    actions.append("right")
-                elif final == b"D":
-                    actions.append("left")
-                i = j + 1
-                continue
-            break
+# Ctrl+C, a CSI sequence (arrows plus any other final byte, which is
+# consumed and ignored), or an SS3 arrow as some terminals send them.
+_KEY_RE = re.compile(rb"\x03|\x1b(?:\[[0-?]*[ -/]*(?P<csi>[@-~])|O(?P<ss3>[A-D]))")
+# A trailing prefix that could still grow into a _KEY_RE match.
+_KEY_PARTIAL_RE = re.compile(rb"\x1b(?:O|\[[0-?]*[ -/]*)?\Z")
 
-        i += 1
 
-    return actions, buf[i:]
+def parse_keys(buf):
+    actions = []
+    pos = 0
+    for match in _KEY_RE.finditer(buf):
+        token = match.group()
+        if token == b"\x03":
+            actions.append("quit")
+        else:
+            final = match.group("csi") or match.group("ss3")
+            if final == b"C":
+                actions.append("right")
+            elif final == b"D":
+                actions.append("left")
+        pos = match.end()
+    # Keep an incomplete escape at the tail so it can finish next read;
+    # everything else is unbound input and is dropped as before.
+    esc = buf.rfind(ESC, pos)
+    if esc != -1 and _KEY_PARTIAL_RE.fullmatch(buf, esc):
+        return actions, buf[esc:]
+    return actions, b""
+
+
+def _open_sigwinch_fd():
+    """Deliver SIGWINCH as a readable fd via signalfd(2).
+
+    Python exposes no signalfd wrapper, so this goes through ctypes; any
+    failure (non-Linux libc, missing symbol) raises and the caller falls
+    back to the wakeup-pipe plumbing.
+    """
+    import ctypes
+    libc = ctypes.CDLL(None, use_errno=True)
+    sigset = (ctypes.c_ulong * 16)()  # large enough for glibc's sigset_t
+    if libc.sigemptyset(ctypes.byref(sigset)) != 0:
+        raise OSError("sigemptyset failed")
+    if libc.sigaddset(ctypes.byref(sigset), int(signal.SIGWINCH)) != 0:
+        raise OSError("sigaddset failed")
+    sfd_nonblock = 0o4000
+    sfd_cloexec = 0o2000000
+    fd = libc.signalfd(-1, ctypes.byref(sigset), sfd_nonblock | sfd_cloexec)
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), "signalfd failed")
+    # Block normal delivery; the signal now surfaces only through the fd.
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGWINCH})
+    return fd
 
 
 class TtyMode:
@@ -285,39 +469,47 @@ def main():
     _set_nonblocking(tty_fd)
 
     sel = selectors.DefaultSelector()
-    sel.register(stdin_fd, selectors.EVENT_READ, data="stdin")
-    sel.register(tty_fd, selectors.EVENT_READ, data="tty")
+    sel.register(stdin_fd, selectors.EVENT_READ)
+    sel.register(tty_fd, selectors.EVENT_READ)
 
     resize_flag = False
 
+    sig_fd = None
     wake_r = wake_w = None
     old_wakeup_fd = None
     use_wakeup = False
 
     try:
-        wake_r, wake_w = os.pipe()
-        _set_nonblocking(wake_r)
-        _set_nonblocking(wake_w)
-        old_wakeup_fd = signal.set_wakeup_fd(wake_w)
-        signal.signal(signal.SIGWINCH, lambda signum, frame: None)
-        sel.register(wake_r, selectors.EVENT_READ, data="signal")
-        use_wakeup = True
+        sig_fd = _open_sigwinch_fd()
+        sel.register(sig_fd, selectors.EVENT_READ)
     except Exception:
-        if wake_r is not None:
-            os.close(wake_r)
-            wake_r = None
-        if wake_w is not None:
-            os.close(wake_w)
-            wake_w = None
-        if old_wakeup_fd is not None:
-            signal.set_wakeup_fd(old_wakeup_fd)
-            old_wakeup_fd = None
-
-        def on_resize(signum, frame):
-            nonlocal resize_flag
-            resize_flag = True
-
-        signal.signal(signal.SIGWINCH, on_resize)
+        sig_fd = None
+
+    if sig_fd is None:
+        try:
+            wake_r, wake_w = os.pipe()
+            _set_nonblocking(wake_r)
+            _set_nonblocking(wake_w)
+            old_wakeup_fd = signal.set_wakeup_fd(wake_w)
+            signal.signal(signal.SIGWINCH, lambda signum, frame: None)
+            sel.register(wake_r, selectors.EVENT_READ)
+            use_wakeup = True
+        except Exception:
+            if wake_r is not None:
+                os.close(wake_r)
+                wake_r = None
+            if wake_w is not None:
+                os.close(wake_w)
+                wake_w = None
+            if old_wakeup_fd is not None:
+                signal.set_wakeup_fd(old_wakeup_fd)
+                old_wakeup_fd = None
+
+            def on_resize(signum, frame):
+                nonlocal resize_flag
+                resize_flag = True
+
+            signal.signal(signal.SIGWINCH, on_resize)
 
     term_width, term_height = get_term_size()
     lines = collections.deque(maxlen=term_height)
@@ -325,11 +517,17 @@ def main():
     max_width = 0
     max_width_dirty = False
     xoff = 0
-    inbuf = b""
+    inbuf = bytearray()
+    # Reusable 64 KB read buffer: readv fills it in place, so steady-state
+    # stdin reads allocate nothing and cost far fewer syscalls per MB.
+    read_buf = bytearray(64 * 1024)
+    read_bufs = [read_buf]
+    read_view = memoryview(read_buf)
     keybuf = b""
     full_redraw = True
     needs_redraw = True
     first = True
+    last_render = 0.0
 
     def ensure_max_width():
         nonlocal max_width_dirty, max_width
@@ -346,16 +544,39 @@ def main():
             return True
         return False
 
-    def append_line(text):
+    last_frame = None
+
+    def draw_frame():
+        # A full redraw repeats the previous one whenever nothing visible
+        # changed (e.g. a key burst that clamped to the same xoff), so
+        # compare against the last drawn state and skip the write if it is
+        # identical. Holding the line tuple keeps those bytes objects alive,
+        # so the comparison can never be confused by object reuse.
+        nonlocal last_frame, first, full_redraw, needs_redraw
+        clamp_xoff()
+        frame = (xoff, term_width, term_height, tuple(lines))
+        if frame != last_frame:
+            render(frame[3], tuple(widths), term_width, term_height, xoff,
+                   first=first)
+            last_frame = frame
+            first = False
+        full_redraw = False
+        needs_redraw = False
+
+    def append_line(line):
         nonlocal max_width, max_width_dirty
         dropped_width = widths[0] if widths.maxlen and len(widths) == widths.maxlen else None
-        line_width = visible_width(text)
-        lines.append(text)
+        line_width = visible_width(line)
+        lines.append(line)
         widths.append(line_width)
-        if dropped_width is not None and dropped_width == max_width:
-            max_width_dirty = True
-        if line_width > max_width:
+        if line_width >= max_width:
+            # The new line is at least as wide as the cached max (even a
+            # stale one is an upper bound for the survivors), so no rescan
+            # is needed regardless of what was evicted.
             max_width = line_width
+            max_width_dirty = False
+        elif dropped_width is not None and dropped_width == max_width:
+            max_width_dirty = True
         return line_width
 
     try:
@@ -369,72 +590,79 @@ def main():
                     max_width_dirty = True
                     full_redraw = True
                     needs_redraw = True
-                timeout = 0 if needs_redraw else None
+                if needs_redraw:
+                    # Wake up at the next frame deadline rather than spinning.
+                    timeout = max(0.0, last_render + FRAME_INTERVAL - time.monotonic())
+                else:
+                    timeout = None
                 try:
                     events = sel.select(timeout)
                 except InterruptedError:
                     events = []
                 for key, _ in events:
-                    if key.data == "stdin":
+                    if key.fd == stdin_fd:
                         while True:
                             try:
-                                chunk = os.read(stdin_fd, 4096)
+                                nread = os.readv(stdin_fd, read_bufs)
                             except BlockingIOError:
                                 break
-                            if not chunk:
+                            if not nread:
                                 if inbuf:
-                                    line = inbuf.rstrip(b"\r")
-                                    text = line.decode("utf-8", "replace")
-                                    append_line(text)
-                                    inbuf = b""
+                                    line = bytes(inbuf).rstrip(b"\r")
+                                    line_width = append_line(line)
+                                    inbuf.clear()
                                     if clamp_xoff():
                                         full_redraw = True
                                         needs_redraw = True
                                     if full_redraw:
                                         needs_redraw = True
                                     else:
-                                        render_incremental(text, term_width, xoff)
+                                        render_incremental(line, line_width,
+                                                           term_width, xoff)
                                 if needs_redraw:
-                                    clamp_xoff()
-                                    render(list(lines), term_width, term_height, xoff, first=first)
-                                    first = False
-                                    full_redraw = False
-                                    needs_redraw = False
+                                    draw_frame()
                                 return 0
-                            inbuf += chunk
-                            while len(inbuf) > MAX_LINE_BYTES:
-                                prefix = inbuf[:MAX_LINE_BYTES]
-                                newline = prefix.rfind(b"\n")
-                                if newline != -1:
-                                    for raw in prefix[:newline].split(b"\n"):
-                                        line = raw.rstrip(b"\r")
-                                        text = line.decode("utf-8", "replace")
-                                        append_line(text)
-                                    inbuf = inbuf[newline + 1:]
-                                    needs_redraw = True
-                                    full_redraw = True
-                                else:
-                                    line = prefix.rstrip(b"\r")
-                                    text = line.decode("utf-8", "replace")
-                                    append_line(text)
-                                    inbuf = inbuf[MAX_LINE_BYTES:]
-                                    needs_redraw = True
-                                    full_redraw = True
-                            parts = inbuf.split(b"\n")
-                            for raw in parts[:-1]:
-                                line = raw.rstrip(b"\r")
-                                text = line.decode("utf-8", "replace")
-                                append_line(text)
-                                if full_redraw:
-                                    needs_redraw = True
-                                else:
+                            inbuf += read_view[:nread]  # in-place bytearray extend
+                            last_nl = inbuf.rfind(b"\n")
+                            if last_nl != -1:
+                                # Keep the final newline so runs of blank
+                                # lines split into the right number of rows.
+                                complete = bytes(inbuf[:last_nl + 1])
+                                del inbuf[:last_nl + 1]
+                                # splitlines handles CRLF (and lone CR) in
+                                # one C pass; lines that would be evicted
+                                # before the next frame are never measured.
+                                new_lines = complete.splitlines()
+                                if len(new_lines) > term_height:
+                                    new_lines = new_lines[-term_height:]
+                                new_widths = [append_line(l) for l in new_lines]
+                                if len(new_lines) == 1 and not full_redraw:
+                                    line = new_lines[0]
                                     if clamp_xoff():
                                         full_redraw = True
                                         needs_redraw = True
                                     else:
-                                        render_incremental(text, term_width, xoff)
-                            inbuf = parts[-1]
-                    elif key.data == "tty":
+                                        now = time.monotonic()
+                                        if now - last_render >= FRAME_INTERVAL:
+                                            render_incremental(line, new_widths[0],
+                                                               term_width, xoff)
+                                            last_render = now
+                                        else:
+                                            # Inside the frame budget: defer
+                                            # to one coalesced full redraw.
+                                            full_redraw = True
+                                            needs_redraw = True
+                                else:
+                                    full_redraw = True
+                                    needs_redraw = True
+                            while len(inbuf) > MAX_LINE_BYTES:
+                                # No newline in the buffer at all; force a
+                                # break so a runaway line cannot grow unbounded.
+                                append_line(bytes(inbuf[:MAX_LINE_BYTES]).rstrip(b"\r"))
+                                del inbuf[:MAX_LINE_BYTES]
+                                needs_redraw = True
+                                full_redraw = True
+                    elif key.fd == tty_fd:
                         try:
                             data = os.read(tty_fd, 1024)
                         except BlockingIOError:
@@ -443,37 +671,36 @@ def main():
                             return 0
                         keybuf += data
                         actions, keybuf = parse_keys(keybuf)
-                        for action in actions:
-                            if action == "left":
-                                new_xoff = max(0, xoff - 1)
-                                if new_xoff != xoff:
-                                    xoff = new_xoff
-                                    full_redraw = True
-                                    needs_redraw = True
-                            elif action == "right":
-                                max_xoff = max(0, ensure_max_width() - term_width)
-                                if xoff < max_xoff:
-                                    xoff += 1
-                                    full_redraw = True
-                                    needs_redraw = True
-                            elif action == "quit":
-                                return 0
-                    elif key.data == "signal":
+                        if "quit" in actions:
+                            return 0
+                        # A held arrow key delivers a burst of events per
+                        # read; apply their net effect with one clamp.
+                        delta = actions.count("right") - actions.count("left")
+                        if delta:
+                            max_xoff = max(0, ensure_max_width() - term_width)
+                            new_xoff = max(0, min(xoff + delta, max_xoff))
+                            if new_xoff != xoff:
+                                xoff = new_xoff
+                                full_redraw = True
+                                needs_redraw = True
+                    else:  # SIGWINCH, via signalfd or the wakeup pipe
                         try:
-                            os.read(wake_r, 1024)
+                            os.read(sig_fd if sig_fd is not None else wake_r, 1024)
                         except BlockingIOError:
                             pass
                         resize_flag = True
 
                 if needs_redraw:
-                    clamp_xoff()
-                    render(list(lines), term_width, term_height, xoff, first=first)
-                    first = False
-                    full_redraw = False
-                    needs_redraw = False
+                    now = time.monotonic()
+                    if now - last_render >= FRAME_INTERVAL:
+                        draw_frame()
+                        last_render = now
     except KeyboardInterrupt:
         return 0
     finally:
+        if sig_fd is not None:
+            os.close(sig_fd)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGWINCH})
         if use_wakeup and old_wakeup_fd is not None:
             signal.set_wakeup_fd(old_wakeup_fd)
         if wake_r is not None: